@@ -15,7 +15,6 @@
 
 import asyncio
 import logging
-import shutil
 from typing import Optional
 
 import click
@@ -24,6 +23,7 @@ from snaphelpers import Snap
 
 from sunbeam import utils
 from sunbeam.commands import juju, ohv
+from sunbeam.commands.configure import invalidate_admin_credentials_cache
 from sunbeam.commands.init import Role
 from sunbeam.commands.terraform import (
     TerraformException,
@@ -40,7 +40,6 @@ from sunbeam.jobs.common import BaseStep, Result, ResultType, Status
 
 LOG = logging.getLogger(__name__)
 console = Console()
-snap = Snap()
 
 
 class DeployControlPlaneStep(BaseStep):
@@ -57,7 +56,7 @@ class DeployControlPlaneStep(BaseStep):
             "Deploying OpenStack Control Plane",
             "Deploying OpenStack Control Plane to Kubernetes",
         )
-        self.path = snap.paths.user_common / "etc" / "deploy"
+        self.path = Snap().paths.user_common / "etc" / "deploy"
         self.model = model
         self.cloud = cloud
         self.jhelper = jhelper
@@ -104,11 +103,16 @@ def bootstrap() -> None:
             "privileges. Try again without sudo."
         )
 
+    snap = Snap()
+
+    # NOTE: credentials change if the control plane is redeployed
+    invalidate_admin_credentials_cache()
+
     # NOTE: install to user writable location
     src = snap.paths.snap / "etc" / "deploy"
     dst = snap.paths.user_common / "etc" / "deploy"
     LOG.debug(f"Updating {dst} from {src}...")
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    utils.sync_directory(src, dst, stamp=snap.revision)
 
     role = snap.config.get("node.role")
     node_role = Role[role.upper()]
@@ -131,10 +135,11 @@ def bootstrap() -> None:
             ]
         )
 
-    for check in preflight_checks:
-        LOG.debug(f"Starting pre-flight check {check.name}")
-        message = f"{check.description} ... "
-        with console.status(f"{check.description} ... "):
+    with console.status("Running pre-flight checks ... ") as status:
+        for check in preflight_checks:
+            LOG.debug(f"Starting pre-flight check {check.name}")
+            message = f"{check.description} ... "
+            status.update(message)
             result = check.run()
             if result:
                 console.print(f"{message}[green]done[/green]")
@@ -164,10 +169,11 @@ def bootstrap() -> None:
         plan.append(ohv.UpdateRabbitMQConfigStep(jhelper=jhelper, model=model))
         plan.append(ohv.UpdateNetworkConfigStep(jhelper=jhelper, model=model))
 
-    for step in plan:
-        LOG.debug(f"Starting step {step.name}")
-        message = f"{step.description} ... "
-        with console.status(f"{step.description} ... "):
+    with console.status("Bootstrapping node ... ") as status:
+        for step in plan:
+            LOG.debug(f"Starting step {step.name}")
+            message = f"{step.description} ... "
+            status.update(message)
             if step.is_skip():
                 LOG.debug(f"Skipping step {step.name}")
                 console.print(f"{message}[green]done[/green]")
@@ -179,11 +185,11 @@ def bootstrap() -> None:
                 f"Finished running step {step.name}. " f"Result: {result.result_type}"
             )
 
-        if result.result_type == ResultType.FAILED:
-            console.print(f"{message}[red]failed[/red]")
-            raise click.ClickException(result.message)
+            if result.result_type == ResultType.FAILED:
+                console.print(f"{message}[red]failed[/red]")
+                raise click.ClickException(result.message)
 
-        console.print(f"{message}[green]done[/green]")
+            console.print(f"{message}[green]done[/green]")
 
     click.echo(f"Node has been bootstrapped as a {role} node")
     asyncio.get_event_loop().run_until_complete(jhelper.disconnect_controller())
@@ -14,15 +14,17 @@
 # limitations under the License.
 
 import asyncio
-import glob
+import functools
 import ipaddress
+import itertools
 import json
 import logging
 import os
-import shutil
+import socket
 import subprocess
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import click
 import netifaces
@@ -42,42 +44,74 @@ from sunbeam.jobs.common import BaseStep, Result, ResultType, Status
 LOG = logging.getLogger(__name__)
 console = Console()
 
+# Lifetime in seconds of the cached cloud admin credentials
+ADMIN_CREDENTIALS_CACHE_TTL = 600
+# Admin credentials which must be set for the credentials to be usable
+REQUIRED_ADMIN_CREDENTIALS = ("OS_AUTH_URL", "OS_USERNAME", "OS_PASSWORD")
 
-def get_nic_macs(nic: str) -> list:
-    """Return list of mac addresses associates with nic."""
-    addrs = netifaces.ifaddresses(nic)
-    return sorted([a["addr"] for a in addrs[netifaces.AF_LINK]])
 
+@functools.lru_cache(maxsize=1)
+def _list_interfaces() -> tuple:
+    """Return the names of all network interfaces.
+
+    The interface list is not expected to change during a single
+    invocation, so it is only queried from the kernel once.
+    """
+    return tuple(netifaces.interfaces())
+
+
+@functools.lru_cache(maxsize=None)
+def _ifaddrs(nic: str) -> dict:
+    """Return the addresses of nic, querying the kernel only once per nic."""
+    return netifaces.ifaddresses(nic)
+
+
+def clear_nic_cache() -> None:
+    """Forget cached interfaces and addresses."""
+    _list_interfaces.cache_clear()
+    _ifaddrs.cache_clear()
+
+
+def get_nic_macs(addrs: dict) -> set:
+    """Return set of mac addresses from the addresses of a nic."""
+    return {a["addr"] for a in addrs.get(netifaces.AF_LINK, ())}
+
+
+def is_configured(addrs: dict) -> bool:
+    """Whether addresses of a nic include an IPv4 or IPv6 address."""
+    return netifaces.AF_INET in addrs or netifaces.AF_INET6 in addrs
 
-def is_configured(nic: str) -> bool:
-    """Whether interface is configured with IPv4 or IPv6 address."""
-    addrs = netifaces.ifaddresses(nic)
-    return bool(addrs.get(netifaces.AF_INET) or addrs.get(netifaces.AF_INET6))
+
+def _list_nic_dir(path: str) -> set:
+    """Return the names of the nics listed in a sysfs or procfs directory."""
+    try:
+        return set(os.listdir(path))
+    except FileNotFoundError:
+        return set()
 
 
 def get_free_nics() -> list:
     """Return a list of nics which doe not have a v4 or v6 address."""
-    virtual_nic_dir = "/sys/devices/virtual/net/*"
-    virtual_nics = [Path(p).name for p in glob.glob(virtual_nic_dir)]
-    bond_nic_dir = "/proc/net/bonding/*"
-    bonds = [Path(p).name for p in glob.glob(bond_nic_dir)]
-    bond_macs = []
+    virtual_nics = _list_nic_dir("/sys/devices/virtual/net")
+    bonds = _list_nic_dir("/proc/net/bonding")
+    bond_macs = set()
     for bond_iface in bonds:
-        bond_macs.extend(get_nic_macs(bond_iface))
+        bond_macs |= get_nic_macs(_ifaddrs(bond_iface))
     candidate_nics = []
-    for nic in netifaces.interfaces():
-        if nic in bonds and not is_configured(nic):
+    for nic in _list_interfaces():
+        addrs = _ifaddrs(nic)
+        if nic in bonds and not is_configured(addrs):
             LOG.debug(f"Found bond {nic}")
             candidate_nics.append(nic)
             continue
-        macs = get_nic_macs(nic)
-        if list(set(macs) & set(bond_macs)):
+        macs = get_nic_macs(addrs)
+        if not macs.isdisjoint(bond_macs):
             LOG.debug(f"Skipping {nic} it is part of a bond")
             continue
         if nic in virtual_nics:
             LOG.debug(f"Skipping {nic} it is virtual")
             continue
-        if is_configured(nic):
+        if is_configured(addrs):
             LOG.debug(f"Skipping {nic} it is configured")
         else:
             LOG.debug(f"Found nic {nic}")
@@ -93,6 +127,31 @@ def get_free_nic() -> str:
     return nic
 
 
+def get_host_defaults(
+    network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+) -> tuple:
+    """Return the first, second and last usable host addresses of network.
+
+    Addresses are returned as strings. Avoids materialising every host of
+    large networks.
+    """
+    if network.version == 4 and network.num_addresses > 2:
+        # hosts() excludes the network and broadcast addresses for IPv4,
+        # so compute them directly and format using the C implementation.
+        network_address = int(network.network_address)
+        broadcast_address = int(network.broadcast_address)
+        return tuple(
+            socket.inet_ntoa(address.to_bytes(4, "big"))
+            for address in (
+                network_address + 1,
+                network_address + 2,
+                broadcast_address - 1,
+            )
+        )
+    first, second = itertools.islice(network.hosts(), 2)
+    return str(first), str(second), str(network.broadcast_address)
+
+
 def user_questions():
     return {
         "username": question_helper.PromptQuestion(
@@ -141,7 +200,7 @@ def ext_net_questions():
         ),
         "nic": question_helper.PromptQuestion(
             "Free network interface microstack can use for external traffic",
-            default_value=get_free_nic(),
+            default_function=get_free_nic,
         ),
     }
 
@@ -172,6 +231,20 @@ def ext_net_questions_local_only():
     }
 
 
+OPENRC_TEMPLATE = "\n".join(
+    (
+        "# openrc for {OS_USERNAME}",
+        "export OS_AUTH_URL={auth_url}",
+        "export OS_USERNAME={OS_USERNAME}",
+        "export OS_PASSWORD={OS_PASSWORD}",
+        "export OS_USER_DOMAIN_NAME={OS_USER_DOMAIN_NAME}",
+        "export OS_PROJECT_DOMAIN_NAME={OS_PROJECT_DOMAIN_NAME}",
+        "export OS_PROJECT_NAME={OS_PROJECT_NAME}",
+        "export OS_AUTH_VERSION={auth_version}",
+        "export OS_IDENTITY_API_VERSION={auth_version}",
+    )
+)
+
 VARIABLE_DEFAULTS = {
     "user": {
         "username": "demo",
@@ -190,7 +263,7 @@ VARIABLE_DEFAULTS = {
 }
 
 
-def _retrieve_admin_credentials(jhelper: JujuHelper, model: str) -> dict:
+async def _retrieve_admin_credentials(jhelper: JujuHelper, model: str) -> dict:
     """Retrieve cloud admin credentials.
 
     Retrieve cloud admin credentials from keystone and
@@ -199,11 +272,10 @@ def _retrieve_admin_credentials(jhelper: JujuHelper, model: str) -> dict:
     """
     app = "keystone"
     action_cmd = "get-admin-account"
-    action_result = asyncio.get_event_loop().run_until_complete(
-        jhelper.run_action(model, app, action_cmd)
-    )
+    action_result = await jhelper.run_action(model, app, action_cmd)
 
-    if action_result.get("return-code", 0) > 1:
+    # NOTE: run_action returns an empty result if the action could not be run
+    if not action_result or action_result.get("return-code", 0) > 1:
         _message = "Unable to retrieve openrc from Keystone service"
         raise click.ClickException(_message)
 
@@ -219,6 +291,98 @@ def _retrieve_admin_credentials(jhelper: JujuHelper, model: str) -> dict:
     }
 
 
+def _has_admin_credentials(credentials: dict) -> bool:
+    """Whether all required admin credentials are set."""
+    return isinstance(credentials, dict) and all(
+        credentials.get(key) for key in REQUIRED_ADMIN_CREDENTIALS
+    )
+
+
+def admin_credentials_cache() -> Path:
+    """Location of the cloud admin credentials cache."""
+    return utils.get_snap().paths.user_data / "admin_creds.json"
+
+
+def invalidate_admin_credentials_cache() -> None:
+    """Remove any cached cloud admin credentials."""
+    try:
+        admin_credentials_cache().unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _read_admin_credentials_cache(model: str) -> Optional[dict]:
+    """Return cached admin credentials for model if present and unexpired."""
+    try:
+        with open(admin_credentials_cache(), "r") as f:
+            cache = json.loads(f.read())
+    except OSError:
+        return None
+    except ValueError:
+        LOG.debug("Cached admin credentials are corrupt")
+        invalidate_admin_credentials_cache()
+        return None
+    if cache.get("model") != model or cache.get("expires_at", 0) < time.time():
+        LOG.debug("Cached admin credentials are stale")
+        invalidate_admin_credentials_cache()
+        return None
+    if not _has_admin_credentials(cache.get("credentials")):
+        LOG.debug("Cached admin credentials are incomplete")
+        invalidate_admin_credentials_cache()
+        return None
+    return cache["credentials"]
+
+
+def _write_admin_credentials_cache(model: str, credentials: dict) -> None:
+    """Write admin credentials for model to the cache, readable by owner only."""
+    if not _has_admin_credentials(credentials):
+        LOG.debug("Not caching incomplete admin credentials")
+        return
+    cache = {
+        "model": model,
+        "expires_at": time.time() + ADMIN_CREDENTIALS_CACHE_TTL,
+        "credentials": credentials,
+    }
+    try:
+        fd = os.open(
+            admin_credentials_cache(), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        # NOTE: mode passed to os.open only applies to new files
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(cache))
+    except OSError as e:
+        LOG.debug(f"Unable to cache admin credentials: {str(e)}")
+
+
+async def _retrieve_admin_credentials_cached(jhelper: JujuHelper, model: str) -> dict:
+    """Retrieve cloud admin credentials, using the cache when possible."""
+    credentials = _read_admin_credentials_cache(model)
+    if credentials:
+        LOG.debug("Using cached admin credentials")
+        return credentials
+    credentials = await _retrieve_admin_credentials(jhelper, model)
+    _write_admin_credentials_cache(model, credentials)
+    return credentials
+
+
+async def _get_admin_credentials(jhelper: JujuHelper, model: str) -> dict:
+    """Check the control plane model exists and retrieve admin credentials.
+
+    All juju interaction needed by configure happens here so that it runs
+    in a single event loop; the controller is disconnected on return.
+    """
+    try:
+        models = await jhelper.get_models()
+        LOG.debug(f"Juju models: {models}")
+        if model not in models:
+            LOG.error(f"Expected model {model} missing")
+            raise click.ClickException("Please run `microstack bootstrap` first")
+        return await _retrieve_admin_credentials_cached(jhelper, model)
+    finally:
+        await jhelper.disconnect_controller()
+
+
 class UserOpenRCStep(BaseStep):
     """Generate openrc for created cloud user."""
 
@@ -241,39 +405,36 @@ class UserOpenRCStep(BaseStep):
             terraform = str(snap.paths.snap / "bin" / "terraform")
             cmd = [terraform, "output", "-json"]
             LOG.debug(f'Running command {" ".join(cmd)}')
+            # NOTE: json.loads parses the output straight from bytes.
             process = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 check=True,
                 cwd=snap.paths.user_common / "etc" / "configure",
             )
             LOG.debug(
-                f"Command finished. stdout={process.stdout}, stderr={process.stderr}"
+                f"Command finished. stdout={process.stdout.decode()}, "
+                f"stderr={process.stderr.decode()}"
             )
             tf_output = json.loads(process.stdout)
-            self._print_openrc(tf_output)
+            values = {k: v["value"] for k, v in tf_output.items()}
+            self._print_openrc(values)
             return Result(ResultType.COMPLETED)
         except subprocess.CalledProcessError as e:
             LOG.exception("Error initializing Terraform")
             return Result(ResultType.FAILED, str(e))
 
-    def _print_openrc(self, tf_output: dict) -> None:
+    def _print_openrc(self, values: dict) -> None:
         """Print openrc to console and save to disk using provided information"""
-        _openrc = f"""# openrc for {tf_output["OS_USERNAME"]["value"]}
-export OS_AUTH_URL={self.auth_url}
-export OS_USERNAME={tf_output["OS_USERNAME"]["value"]}
-export OS_PASSWORD={tf_output["OS_PASSWORD"]["value"]}
-export OS_USER_DOMAIN_NAME={tf_output["OS_USER_DOMAIN_NAME"]["value"]}
-export OS_PROJECT_DOMAIN_NAME={tf_output["OS_PROJECT_DOMAIN_NAME"]["value"]}
-export OS_PROJECT_NAME={tf_output["OS_PROJECT_NAME"]["value"]}
-export OS_AUTH_VERSION={self.auth_version}
-export OS_IDENTITY_API_VERSION={self.auth_version}"""
+        _openrc = OPENRC_TEMPLATE.format(
+            auth_url=self.auth_url, auth_version=self.auth_version, **values
+        )
         if self.openrc:
             message = f"Writing openrc to {self.openrc} ... "
-            console.status(message)
-            with open(self.openrc, "w") as f_openrc:
-                os.fchmod(f_openrc.fileno(), mode=0o640)
+            fd = os.open(self.openrc, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
+            # NOTE: mode passed to os.open only applies to new files
+            os.fchmod(fd, 0o640)
+            with os.fdopen(fd, "w") as f_openrc:
                 f_openrc.write(_openrc)
             console.print(f"{message}[green]done[/green]")
         else:
@@ -322,81 +483,59 @@ class ConfigureCloudStep(BaseStep):
             preseed = question_helper.read_preseed(self.preseed_file)
         else:
             preseed = {}
+        user = self.variables["user"]
+        ext_net = self.variables["external_network"]
         user_bank = question_helper.QuestionBank(
             questions=user_questions(),
             console=console,
             preseed=preseed.get("user"),
-            previous_answers=self.variables.get("user"),
+            previous_answers=user,
             accept_defaults=self.accept_defaults,
         )
         # User configuration
-        self.variables["user"]["username"] = user_bank.username.ask()
-        self.variables["user"]["password"] = user_bank.password.ask()
-        self.variables["user"]["cidr"] = user_bank.cidr.ask()
-        self.variables["user"][
-            "security_group_rules"
-        ] = user_bank.security_group_rules.ask()
-        self.variables["user"][
-            "remote_access_location"
-        ] = user_bank.remote_access_location.ask()
+        user["username"] = user_bank.username.ask()
+        user["password"] = user_bank.password.ask()
+        user["cidr"] = user_bank.cidr.ask()
+        user["security_group_rules"] = user_bank.security_group_rules.ask()
+        user["remote_access_location"] = user_bank.remote_access_location.ask()
+        local_access = user["remote_access_location"] == utils.LOCAL_ACCESS
 
         # External Network Configuration
-        if self.variables["user"]["remote_access_location"] == utils.LOCAL_ACCESS:
-            ext_net_bank = question_helper.QuestionBank(
-                questions=ext_net_questions_local_only(),
-                console=console,
-                preseed=preseed.get("external_network"),
-                previous_answers=self.variables.get("external_network"),
-                accept_defaults=self.accept_defaults,
-            )
+        if local_access:
+            questions = ext_net_questions_local_only()
         else:
-            ext_net_bank = question_helper.QuestionBank(
-                questions=ext_net_questions(),
-                console=console,
-                preseed=preseed.get("external_network"),
-                previous_answers=self.variables.get("external_network"),
-                accept_defaults=self.accept_defaults,
-            )
-        self.variables["external_network"]["cidr"] = ext_net_bank.cidr.ask()
-        external_network = ipaddress.ip_network(
-            self.variables["external_network"]["cidr"]
-        )
-        external_network_hosts = list(external_network.hosts())
-        default_gateway = self.variables["external_network"].get("gateway") or str(
-            external_network_hosts[0]
+            questions = ext_net_questions()
+        ext_net_bank = question_helper.QuestionBank(
+            questions=questions,
+            console=console,
+            preseed=preseed.get("external_network"),
+            previous_answers=ext_net,
+            accept_defaults=self.accept_defaults,
         )
-        if self.variables["user"]["remote_access_location"] == utils.LOCAL_ACCESS:
-            self.variables["external_network"]["gateway"] = default_gateway
+        ext_net["cidr"] = ext_net_bank.cidr.ask()
+        external_network = ipaddress.ip_network(ext_net["cidr"])
+        first_host, second_host, last_host = get_host_defaults(external_network)
+        default_gateway = ext_net.get("gateway") or first_host
+        if local_access:
+            ext_net["gateway"] = default_gateway
         else:
-            self.variables["external_network"]["nic"] = ext_net_bank.nic.ask()
-            self.variables["external_network"]["gateway"] = ext_net_bank.gateway.ask(
-                new_default=default_gateway
-            )
-        default_allocation_range_start = self.variables["external_network"].get(
-            "start"
-        ) or str(external_network_hosts[1])
-        self.variables["external_network"]["start"] = ext_net_bank.start.ask(
+            ext_net["nic"] = ext_net_bank.nic.ask()
+            ext_net["gateway"] = ext_net_bank.gateway.ask(new_default=default_gateway)
+        default_allocation_range_start = ext_net.get("start") or second_host
+        ext_net["start"] = ext_net_bank.start.ask(
             new_default=default_allocation_range_start
         )
-        default_allocation_range_end = self.variables["external_network"].get(
-            "end"
-        ) or str(external_network_hosts[-1])
-        self.variables["external_network"]["end"] = ext_net_bank.end.ask(
-            new_default=default_allocation_range_end
-        )
-        self.variables["external_network"]["physical_network"] = VARIABLE_DEFAULTS[
-            "external_network"
-        ]["physical_network"]
-
-        self.variables["external_network"][
-            "network_type"
-        ] = ext_net_bank.network_type.ask()
-        if self.variables["external_network"]["network_type"] == "vlan":
-            self.variables["external_network"][
-                "segmentation_id"
-            ] = ext_net_bank.segmentation_id.ask()
+        default_allocation_range_end = ext_net.get("end") or last_host
+        ext_net["end"] = ext_net_bank.end.ask(new_default=default_allocation_range_end)
+        ext_net["physical_network"] = VARIABLE_DEFAULTS["external_network"][
+            "physical_network"
+        ]
+
+        ext_net["network_type"] = ext_net_bank.network_type.ask()
+        if ext_net["network_type"] == "vlan":
+            ext_net["segmentation_id"] = ext_net_bank.segmentation_id.ask()
         else:
-            self.variables["external_network"]["segmentation_id"] = 0
+            ext_net["segmentation_id"] = 0
 
         LOG.debug(self.variables)
         question_helper.write_answers(self.variables)
@@ -424,16 +563,11 @@ def configure(
     src = snap.paths.snap / "etc" / "configure"
     dst = snap.paths.user_common / "etc" / "configure"
     LOG.debug(f"Updating {dst} from {src}...")
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    utils.sync_directory(src, dst, stamp=snap.revision)
 
     model = snap.config.get("control-plane.model")
     jhelper = JujuHelper()
-    models = asyncio.get_event_loop().run_until_complete(jhelper.get_models())
-    LOG.debug(f"Juju models: {models}")
-    if model not in models:
-        LOG.error(f"Expected model {model} missing")
-        raise click.ClickException("Please run `microstack bootstrap` first")
-    admin_credentials = _retrieve_admin_credentials(jhelper, model)
+    admin_credentials = asyncio.run(_get_admin_credentials(jhelper, model))
     tfhelper = TerraformHelper(
         path=snap.paths.user_common / "etc" / "configure", env=admin_credentials
     )
@@ -455,10 +589,11 @@ def configure(
         ),
         UpdateExternalNetworkConfigStep(ext_network=ext_network_file),
     ]
-    for step in plan:
-        LOG.debug(f"Starting step {step.name}")
-        message = f"{step.description} ... "
-        with console.status(message) as status:
+    with console.status("Configuring cloud ... ") as status:
+        for step in plan:
+            LOG.debug(f"Starting step {step.name}")
+            message = f"{step.description} ... "
+            status.update(message)
             if step.has_prompts():
                 status.stop()
                 step.prompt(console)
@@ -475,10 +610,8 @@ def configure(
                 f"Finished running step {step.name}. Result: {result.result_type}"
             )
 
-        if result.result_type == ResultType.FAILED:
-            console.print(f"{message}[red]failed[/red]")
-            raise click.ClickException(result.message)
+            if result.result_type == ResultType.FAILED:
+                console.print(f"{message}[red]failed[/red]")
+                raise click.ClickException(result.message)
 
-        console.print(f"{message}[green]done[/green]")
-
-    asyncio.get_event_loop().run_until_complete(jhelper.disconnect_controller())
+            console.print(f"{message}[green]done[/green]")
@@ -29,7 +29,6 @@ from sunbeam.jobs.common import ResultType
 
 LOG = logging.getLogger(__name__)
 console = Console()
-snap = Snap()
 
 
 @click.command()
@@ -40,6 +39,7 @@ def inspect() -> None:
     issue it finds, and create a tarball of logs and traces which can be
     attached to an issue filed against the microstack project.
     """
+    snap = Snap()
     model = snap.config.get("control-plane.model")
     time_stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     file_name = f"microstack-inspection-report-{time_stamp}.tar.gz"
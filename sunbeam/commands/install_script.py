@@ -13,8 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
-
 import click
 from rich.console import Console
 
@@ -48,9 +46,10 @@ DEFAULT = {
     "hypervisor_channel": "yoga/beta",
 }
 
+_INSTALL_SCRIPT = INSTALL_SCRIPT_TEMPLATE.format(**DEFAULT)
+
 
 @click.command()
 def install_script() -> None:
     """Generate install script"""
-    ctxt = copy.deepcopy(DEFAULT)
-    console.print(INSTALL_SCRIPT_TEMPLATE.format(**ctxt))
+    console.print(_INSTALL_SCRIPT)
@@ -22,7 +22,6 @@ import time
 from pathlib import Path
 from typing import Optional
 
-from juju.controller import Controller
 from semver import VersionInfo
 from snaphelpers import Snap
 
@@ -40,15 +39,23 @@ class JujuHelper:
 
         self.controller = None
 
+    async def connect_controller(self):
+        """Connect to the juju controller if not already connected"""
+        if not self.controller:
+            # NOTE: libjuju is slow to import, only load it when a command
+            # needs to talk to juju.
+            from juju.controller import Controller
+
+            self.controller = Controller()
+            await self.controller.connect()
+
     async def disconnect_controller(self):
         await self.controller.disconnect()
 
     async def add_model(self, model: str) -> bool:
         """Add model to juju"""
         try:
-            if not self.controller:
-                self.controller = Controller()
-                await self.controller.connect()
+            await self.connect_controller()
 
             await self.controller.add_model(model)
             return True
@@ -59,9 +66,7 @@ class JujuHelper:
     async def get_models(self) -> dict:
         """Get all models"""
         try:
-            if not self.controller:
-                self.controller = Controller()
-                await self.controller.connect()
+            await self.connect_controller()
 
             models = await self.controller.list_models()
             return models
@@ -71,9 +76,7 @@ class JujuHelper:
 
     async def get_model_status_full(self, model: str, timeout: int) -> dict:
         """Get juju status for the model"""
-        if not self.controller:
-            self.controller = Controller()
-            await self.controller.connect()
+        await self.connect_controller()
 
         model = await self.controller.get_model(model)
         status = await model.get_status()
@@ -84,9 +87,7 @@ class JujuHelper:
         apps_status = {}
 
         try:
-            if not self.controller:
-                self.controller = Controller()
-                await self.controller.connect()
+            await self.connect_controller()
 
             # Get the reference to the specified model
             model = await self.controller.get_model(model)
@@ -123,9 +124,7 @@ class JujuHelper:
     async def deploy_bundle(self, model: str, bundle: str) -> bool:
         """Deploy bundle"""
         try:
-            if not self.controller:
-                self.controller = Controller()
-                await self.controller.connect()
+            await self.connect_controller()
 
             # Get the reference to the specified model
             model = await self.controller.get_model(model)
@@ -149,9 +148,7 @@ class JujuHelper:
 
     async def wait_until_active(self, model: str) -> None:
         """Wait for all units in model to reach active status"""
-        if not self.controller:
-            self.controller = Controller()
-            await self.controller.connect()
+        await self.connect_controller()
 
         model = await self.controller.get_model(model)
 
@@ -166,9 +163,7 @@ class JujuHelper:
     async def destroy_model(self, model_name: str, wait: bool = True) -> bool:
         """Destroy the model"""
         try:
-            if not self.controller:
-                self.controller = Controller()
-                await self.controller.connect()
+            await self.connect_controller()
 
             await self.controller.destroy_models(
                 model_name, destroy_storage=True, force=True, max_wait=0
@@ -177,17 +172,20 @@ class JujuHelper:
             if wait:
                 LOG.debug("Waiting for model to be removed")
                 # Cannot use block_until as that is a method from the
-                # model being destroyed.
-                for i in range(0, 30):
+                # model being destroyed. Poll quickly at first as small
+                # models go away fast, backing off up to 10 seconds.
+                interval = 0.25
+                deadline = time.monotonic() + 300
+                while True:
                     models = await self.get_models()
                     if model_name not in models:
                         LOG.debug("Model has gone")
                         return True
-                    else:
-                        LOG.debug("Model still present")
-                        await asyncio.sleep(10.0)
-                else:
-                    return False
+                    if time.monotonic() > deadline:
+                        return False
+                    LOG.debug("Model still present")
+                    await asyncio.sleep(interval)
+                    interval = min(interval * 2, 10.0)
             return True
         except Exception as e:
             LOG.error(f"Error in destroying model: {str(e)}")
@@ -208,9 +206,7 @@ class JujuHelper:
         action_result = {}
 
         try:
-            if not self.controller:
-                self.controller = Controller()
-                await self.controller.connect()
+            await self.connect_controller()
 
             # Get the reference to the specified model
             model = await self.controller.get_model(model)
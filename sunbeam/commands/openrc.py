@@ -24,7 +24,14 @@ from sunbeam.commands import juju
 
 LOG = logging.getLogger(__name__)
 console = Console()
-snap = Snap()
+
+
+async def _retrieve_openrc(jhelper: juju.JujuHelper, model: str) -> dict:
+    """Run the keystone get-admin-account action and disconnect."""
+    try:
+        return await jhelper.run_action(model, "keystone", "get-admin-account")
+    finally:
+        await jhelper.disconnect_controller()
 
 
 @click.command()
@@ -33,21 +40,16 @@ def openrc() -> None:
 
     Retrieve openrc for cloud admin account
     """
+    snap = Snap()
     model = snap.config.get("control-plane.model")
     jhelper = juju.JujuHelper()
 
     with console.status("Retrieving openrc from Keystone service ... "):
         # Retrieve config from juju actions
-        app = "keystone"
-        action_cmd = "get-admin-account"
-        action_result = asyncio.get_event_loop().run_until_complete(
-            jhelper.run_action(model, app, action_cmd)
-        )
+        action_result = asyncio.run(_retrieve_openrc(jhelper, model))
 
         if action_result.get("return-code", 0) > 1:
             _message = "Unable to retrieve openrc from Keystone service"
             raise click.ClickException(_message)
         else:
             console.print(action_result.get("openrc"))
-
-    asyncio.get_event_loop().run_until_complete(jhelper.disconnect_controller())
@@ -229,6 +229,8 @@ def load_answers(file_name: str = None) -> dict:
 def write_answers(answers, file_name: str = None):
     """Write answers to answer file."""
     terraform_tfvars = file_name or answer_file()
-    with open(terraform_tfvars, "w") as tfvars:
-        os.fchmod(tfvars.fileno(), mode=0o640)
+    fd = os.open(terraform_tfvars, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
+    # NOTE: mode passed to os.open only applies to new files
+    os.fchmod(fd, 0o640)
+    with os.fdopen(fd, "w") as tfvars:
         tfvars.write(json.dumps(answers))
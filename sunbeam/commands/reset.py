@@ -23,12 +23,12 @@ from rich.console import Console
 from snaphelpers import Snap
 
 from sunbeam.commands import juju, ohv
+from sunbeam.commands.configure import invalidate_admin_credentials_cache
 from sunbeam.commands.init import Role
 from sunbeam.jobs.common import BaseStep, Result, ResultType, Status
 
 LOG = logging.getLogger(__name__)
 console = Console()
-snap = Snap()
 
 
 class PurgeTerraformStateStep(BaseStep):
@@ -40,6 +40,7 @@ class PurgeTerraformStateStep(BaseStep):
         )
 
     def run(self, status: Optional[Status] = None) -> Result:
+        snap = Snap()
         configure_dir = snap.paths.user_common / "etc" / "configure"
         if configure_dir.exists():
             shutil.rmtree(path=configure_dir)
@@ -64,12 +65,16 @@ def reset() -> None:
     """
     # context = click.get_current_context(silent=True)
 
+    snap = Snap()
     role = snap.config.get("node.role")
     node_role = Role[role.upper()]
 
     model = snap.config.get("control-plane.model")
     jhelper = juju.JujuHelper()
 
+    # NOTE: cached credentials belong to the model being destroyed
+    invalidate_admin_credentials_cache()
+
     plan = []
 
     if node_role.is_compute_node() or node_role.is_converged_node():
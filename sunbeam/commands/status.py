@@ -25,7 +25,6 @@ from sunbeam.jobs.common import ResultType
 
 LOG = logging.getLogger(__name__)
 console = Console()
-snap = Snap()
 
 
 @click.command()
@@ -42,6 +41,7 @@ def status(wait_ready: bool, timeout: int) -> None:
     """
     # context = click.get_current_context(silent=True)
 
+    snap = Snap()
     model = snap.config.get("control-plane.model")
     jhelper = juju.JujuHelper()
 
@@ -50,6 +50,21 @@ class TerraformHelper:
         self.env = env
         self.parallelism = parallelism
         self.terraform = str(self.snap.paths.snap / "bin" / "terraform")
+        # Environment shared by all terraform commands; TF_LOG_PATH is set
+        # per command unless supplied by the caller.
+        self._env = os.environ.copy()
+        self._env.pop("TF_LOG_PATH", None)
+        self._env["TF_LOG"] = "INFO"
+        if env:
+            self._env.update(env)
+
+    def _command_env(self, command: str) -> dict:
+        """Environment for running a terraform command, with its own log."""
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        tf_log = str(self.path / f"terraform-{command}-{timestamp}.log")
+        os_env = dict(self._env)
+        os_env.setdefault("TF_LOG_PATH", tf_log)
+        return os_env
 
     def write_tfvars(self, vars: dict) -> None:
         """Write terraform variables file"""
@@ -58,12 +73,7 @@ class TerraformHelper:
 
     def init(self) -> None:
         """terraform init"""
-        os_env = os.environ.copy()
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        tf_log = str(self.path / f"terraform-init-{timestamp}.log")
-        os_env.update({"TF_LOG": "INFO", "TF_LOG_PATH": tf_log})
-        if self.env:
-            os_env.update(self.env)
+        os_env = self._command_env("init")
         try:
             cmd = [self.terraform, "init"]
             LOG.debug(f'Running command {" ".join(cmd)}')
@@ -84,12 +94,7 @@ class TerraformHelper:
 
     def apply(self):
         """terraform apply"""
-        os_env = os.environ.copy()
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        tf_log = str(self.path / f"terraform-apply-{timestamp}.log")
-        os_env.update({"TF_LOG": "INFO", "TF_LOG_PATH": tf_log})
-        if self.env:
-            os_env.update(self.env)
+        os_env = self._command_env("apply")
         try:
             cmd = [self.terraform, "apply", "-auto-approve"]
             if self.parallelism is not None:
@@ -16,8 +16,10 @@
 import base64
 import binascii
 import os
+import shutil
 import socket
 import typing
+from pathlib import Path
 
 from netifaces import AF_INET, ifaddresses, interfaces
 from semver import VersionInfo
@@ -28,6 +30,9 @@ UNKNOWN_VERSION = VersionInfo(0, 0, 0)
 LOCAL_ACCESS = "local"
 REMOTE_ACCESS = "remote"
 
+# Records which content of a directory was copied by sync_directory
+SYNC_STAMP_FILE = ".sync-stamp"
+
 
 def get_snap():
     """Returns the current snap environment.
@@ -129,6 +134,34 @@ def get_local_ip_by_default_route() -> str:
     return ip
 
 
+def sync_directory(src: Path, dst: Path, stamp: typing.Optional[str] = None) -> None:
+    """Copy the files from src into dst unless already copied for stamp.
+
+    After a successful copy, stamp is recorded in dst. Later calls with the
+    same stamp skip the copy without reading either tree, so the stamp
+    must change whenever the content of src may have changed, e.g. the
+    snap revision. Without a stamp all files are always copied. Files only
+    present in dst are left alone.
+
+    :param src: the directory to copy from
+    :type src: Path
+    :param dst: the directory to copy to
+    :type dst: Path
+    :param stamp: identifier for the content of src
+    :type stamp: str
+    """
+    stamp_file = dst / SYNC_STAMP_FILE
+    if stamp is not None:
+        try:
+            if stamp_file.read_text() == stamp:
+                return
+        except OSError:
+            pass
+    shutil.copytree(src, dst, dirs_exist_ok=True)
+    if stamp is not None:
+        stamp_file.write_text(stamp)
+
+
 def encode_tls(cert_or_key: str) -> str:
     """Encode key or cert.
 
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
+import types
 from unittest.mock import MagicMock, patch
 
 import netifaces
@@ -86,34 +86,31 @@ bond_config = {
 }
 
 
+_NIC_MAP = types.MappingProxyType({**nic_config, **bond_config})
+_INTERFACES = list(_NIC_MAP)
+
+
 @pytest.fixture
 def ifaddresses():
     with patch("netifaces.ifaddresses") as p:
-
-        def _ifaddresses(nic):
-            return nic_config.get(nic) or bond_config.get(nic)
-
-        p.side_effect = _ifaddresses
+        p.side_effect = _NIC_MAP.get
         yield p
 
 
 @pytest.fixture
 def interfaces():
     with patch("netifaces.interfaces") as p:
-        p.return_value = list(nic_config.keys()) + list(bond_config.keys())
+        p.return_value = _INTERFACES
         yield p
 
 
 @pytest.fixture
-def pglob():
-    def _glob(path):
+def listdir():
+    def _listdir(path):
         if path.startswith("/sys/devices/virtual/net"):
-            nics = ["ovs-system", "bond0", "bond1"]
-        else:
-            nics = ["bond0", "bond1"]
-        nics = [os.path.dirname(path) + f"/{n}" for n in nics]
-        return nics
-
-    with patch("glob.glob") as p:
-        p.side_effect = _glob
+            return ["ovs-system", "bond0", "bond1"]
+        return ["bond0", "bond1"]
+
+    with patch("os.listdir") as p:
+        p.side_effect = _listdir
         yield p
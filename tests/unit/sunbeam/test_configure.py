@@ -13,18 +13,40 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import ipaddress
+import json
+from unittest.mock import AsyncMock
+
+import click
+import pytest
+
 from sunbeam.commands import configure
 
+ADMIN_CREDENTIALS = {
+    "OS_USERNAME": "admin",
+    "OS_PASSWORD": "secret",
+    "OS_AUTH_URL": "http://keystone:5000/v3",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_nic_cache():
+    configure.clear_nic_cache()
+    yield
+    configure.clear_nic_cache()
+
 
 class TestConfigure:
     def test_get_nic_macs(self, ifaddresses):
-        assert configure.get_nic_macs("eth0") == ["eth0mac1", "eth0mac2"]
+        addrs = ifaddresses("eth0")
+        assert configure.get_nic_macs(addrs) == {"eth0mac1", "eth0mac2"}
 
     def test_is_configured(self, ifaddresses):
-        assert configure.is_configured("eth0")
-        assert not configure.is_configured("eth2")
+        assert configure.is_configured(ifaddresses("eth0"))
+        assert not configure.is_configured(ifaddresses("eth2"))
 
-    def test_get_free_nics(self, pglob, ifaddresses, interfaces):
+    def test_get_free_nics(self, listdir, ifaddresses, interfaces):
         # ['eth2', 'eth3', 'ovs-system', 'bond0', 'bond1']
         # Should see:
         #     eth0 dropped for being ipv4 configured
@@ -38,3 +60,120 @@ class TestConfigure:
         #     bond0 pass
         #     bond1 dropped for being ipv4 configured
         assert configure.get_free_nics() == ["eth4", "bond0"]
+
+    def test_get_free_nics_queries_each_nic_once(
+        self, listdir, ifaddresses, interfaces
+    ):
+        configure.get_free_nics()
+        queried = [c.args[0] for c in ifaddresses.call_args_list]
+        assert sorted(queried) == sorted(set(queried))
+
+    def test_get_free_nics_cached(self, listdir, ifaddresses, interfaces):
+        configure.get_free_nics()
+        calls = ifaddresses.call_count
+        assert configure.get_free_nics() == ["eth4", "bond0"]
+        assert ifaddresses.call_count == calls
+        interfaces.assert_called_once_with()
+
+    def test_ext_net_questions_defers_nic_lookup(self, mocker):
+        get_free_nics = mocker.patch.object(configure, "get_free_nics")
+        get_free_nics.return_value = ["eth4"]
+        questions = configure.ext_net_questions()
+        get_free_nics.assert_not_called()
+        assert questions["nic"].calculate_default() == "eth4"
+
+    def test_admin_credentials_cache(self, mocker, tmp_path):
+        cache = tmp_path / "admin_creds.json"
+        mocker.patch.object(configure, "admin_credentials_cache", return_value=cache)
+        cache.write_text("{}")
+        cache.chmod(0o644)
+
+        configure._write_admin_credentials_cache("openstack", ADMIN_CREDENTIALS)
+        assert cache.stat().st_mode & 0o777 == 0o600
+        credentials = configure._read_admin_credentials_cache("openstack")
+        assert credentials == ADMIN_CREDENTIALS
+        configure.invalidate_admin_credentials_cache()
+        assert not cache.exists()
+
+    def test_admin_credentials_cache_other_model(self, mocker, tmp_path):
+        cache = tmp_path / "admin_creds.json"
+        mocker.patch.object(configure, "admin_credentials_cache", return_value=cache)
+
+        configure._write_admin_credentials_cache("openstack", ADMIN_CREDENTIALS)
+        assert configure._read_admin_credentials_cache("other") is None
+        assert not cache.exists()
+
+    def test_admin_credentials_cache_stale(self, mocker, tmp_path):
+        cache = tmp_path / "admin_creds.json"
+        mocker.patch.object(configure, "admin_credentials_cache", return_value=cache)
+        mocker.patch.object(configure, "ADMIN_CREDENTIALS_CACHE_TTL", -1)
+
+        configure._write_admin_credentials_cache("openstack", ADMIN_CREDENTIALS)
+        assert cache.exists()
+        assert configure._read_admin_credentials_cache("openstack") is None
+        assert not cache.exists()
+
+    def test_admin_credentials_cache_incomplete(self, mocker, tmp_path):
+        cache = tmp_path / "admin_creds.json"
+        mocker.patch.object(configure, "admin_credentials_cache", return_value=cache)
+        incomplete = dict(ADMIN_CREDENTIALS, OS_AUTH_URL=None)
+
+        configure._write_admin_credentials_cache("openstack", incomplete)
+        assert not cache.exists()
+
+        cache.write_text(
+            json.dumps(
+                {"model": "openstack", "expires_at": 2**40, "credentials": incomplete}
+            )
+        )
+        assert configure._read_admin_credentials_cache("openstack") is None
+        assert not cache.exists()
+
+    def test_retrieve_admin_credentials_empty_result(self, mocker, tmp_path):
+        cache = tmp_path / "admin_creds.json"
+        mocker.patch.object(configure, "admin_credentials_cache", return_value=cache)
+        jhelper = mocker.Mock()
+        jhelper.run_action = AsyncMock(return_value={})
+
+        with pytest.raises(click.ClickException):
+            asyncio.run(
+                configure._retrieve_admin_credentials_cached(jhelper, "openstack")
+            )
+        assert not cache.exists()
+
+    @pytest.mark.parametrize(
+        "cidr",
+        ["10.20.20.0/24", "10.0.0.0/16", "10.0.0.0/30", "10.0.0.0/31", "fd00::/120"],
+    )
+    def test_get_host_defaults(self, cidr):
+        network = ipaddress.ip_network(cidr)
+        hosts = list(network.hosts())
+        expected = (str(hosts[0]), str(hosts[1]), str(hosts[-1]))
+        assert configure.get_host_defaults(network) == expected
+
+    def test_user_openrc_step_writes_openrc(self, tmp_path):
+        openrc = tmp_path / "demo_openrc"
+        openrc.write_text("stale")
+        openrc.chmod(0o644)
+        step = configure.UserOpenRCStep("http://keystone:5000/v3", "3", str(openrc))
+        step._print_openrc(
+            {
+                "OS_USERNAME": "demo",
+                "OS_PASSWORD": "secret",
+                "OS_USER_DOMAIN_NAME": "users",
+                "OS_PROJECT_DOMAIN_NAME": "users",
+                "OS_PROJECT_NAME": "demo",
+            }
+        )
+        assert openrc.read_text().splitlines() == [
+            "# openrc for demo",
+            "export OS_AUTH_URL=http://keystone:5000/v3",
+            "export OS_USERNAME=demo",
+            "export OS_PASSWORD=secret",
+            "export OS_USER_DOMAIN_NAME=users",
+            "export OS_PROJECT_DOMAIN_NAME=users",
+            "export OS_PROJECT_NAME=demo",
+            "export OS_AUTH_VERSION=3",
+            "export OS_IDENTITY_API_VERSION=3",
+        ]
+        assert openrc.stat().st_mode & 0o777 == 0o640
@@ -159,5 +159,8 @@ class TestQuestionHelpers(unittest.TestCase):
         test_data = {"foo": "ba"}
         with tempfile.TemporaryDirectory() as tmpdirname:
             answer_file = pathlib.Path(tmpdirname + "/seed_data.yaml")
+            answer_file.write_text("{}")
+            answer_file.chmod(0o644)
             question_helper.write_answers(test_data, answer_file)
             self.assertEqual(question_helper.load_answers(answer_file), test_data)
+            self.assertEqual(answer_file.stat().st_mode & 0o777, 0o640)
@@ -27,9 +27,12 @@ from sunbeam.jobs.common import ResultType
 class TestTerraform:
     """Unit tests for sunbeam terraform helper."""
 
-    def test_terraform_helper_init(self, mocker, run, snap, environ):
+    @pytest.fixture(autouse=True)
+    def patch_snap(self, mocker, snap, environ):
         mocker.patch.object(terraform, "Snap", return_value=snap)
         environ.copy.return_value = {}
+
+    def test_terraform_helper_init(self, run, snap):
         tfhelper = terraform.TerraformHelper(path=pathlib.Path("/foo/bar"))
 
         tfhelper.init()
@@ -46,9 +49,7 @@ class TestTerraform:
             env={"TF_LOG": "INFO", "TF_LOG_PATH": ANY},
         )
 
-    def test_terraform_helper_init_with_env(self, mocker, run, snap, environ):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
-        environ.copy.return_value = {}
+    def test_terraform_helper_init_with_env(self, run, snap):
         tfhelper = terraform.TerraformHelper(
             path=pathlib.Path("/foo/bar"),
             env={"foo": "bar"},
@@ -68,9 +69,7 @@ class TestTerraform:
             env={"TF_LOG": "INFO", "TF_LOG_PATH": ANY, "foo": "bar"},
         )
 
-    def test_terraform_helper_init_with_exception(self, mocker, run, snap, environ):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
-        environ.copy.return_value = {}
+    def test_terraform_helper_init_with_exception(self, run):
         tfhelper = terraform.TerraformHelper(path=pathlib.Path("/foo/bar"))
 
         run.side_effect = subprocess.CalledProcessError(returncode=1, cmd="foobar")
@@ -78,9 +77,7 @@ class TestTerraform:
         with pytest.raises(terraform.TerraformException):
             tfhelper.init()
 
-    def test_terraform_helper_apply(self, mocker, run, snap, environ):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
-        environ.copy.return_value = {}
+    def test_terraform_helper_apply(self, run, snap):
         tfhelper = terraform.TerraformHelper(path=pathlib.Path("/foo/bar"))
 
         tfhelper.apply()
@@ -94,9 +91,7 @@ class TestTerraform:
             env={"TF_LOG": "INFO", "TF_LOG_PATH": ANY},
         )
 
-    def test_terraform_helper_apply_with_env(self, mocker, run, snap, environ):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
-        environ.copy.return_value = {}
+    def test_terraform_helper_apply_with_env(self, run, snap):
         tfhelper = terraform.TerraformHelper(
             path=pathlib.Path("/foo/bar"),
             env={"foo": "bar"},
@@ -113,9 +108,7 @@ class TestTerraform:
             env={"TF_LOG": "INFO", "TF_LOG_PATH": ANY, "foo": "bar"},
         )
 
-    def test_terraform_helper_apply_with_parallelism(self, mocker, run, snap, environ):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
-        environ.copy.return_value = {}
+    def test_terraform_helper_apply_with_parallelism(self, run, snap):
         tfhelper = terraform.TerraformHelper(
             path=pathlib.Path("/foo/bar"), parallelism=1
         )
@@ -136,8 +129,22 @@ class TestTerraform:
             env=ANY,
         )
 
-    def test_terraform_helper_apply_with_exception(self, mocker, run, snap):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
+    def test_terraform_helper_env_built_once(self, run, environ):
+        tfhelper = terraform.TerraformHelper(
+            path=pathlib.Path("/foo/bar"),
+            env={"foo": "bar"},
+        )
+
+        tfhelper.init()
+        tfhelper.apply()
+
+        environ.copy.assert_called_once_with()
+        init_env = run.call_args_list[0].kwargs["env"]
+        apply_env = run.call_args_list[1].kwargs["env"]
+        assert init_env["TF_LOG_PATH"].startswith("/foo/bar/terraform-init-")
+        assert apply_env["TF_LOG_PATH"].startswith("/foo/bar/terraform-apply-")
+
+    def test_terraform_helper_apply_with_exception(self, run):
         tfhelper = terraform.TerraformHelper(path=pathlib.Path("/foo/bar"))
 
         run.side_effect = subprocess.CalledProcessError(returncode=1, cmd="foobar")
@@ -145,8 +152,7 @@ class TestTerraform:
         with pytest.raises(terraform.TerraformException):
             tfhelper.apply()
 
-    def test_terraform_write_tfvars(self, mocker, snap):
-        mocker.patch.object(terraform, "Snap", return_value=snap)
+    def test_terraform_write_tfvars(self, mocker):
         mock_file = mocker.patch("builtins.open", mocker.mock_open())
         tfhelper = terraform.TerraformHelper(path=pathlib.Path("/foo/bar"))
 
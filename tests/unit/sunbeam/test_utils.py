@@ -13,7 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from semver import VersionInfo
 
@@ -41,6 +45,42 @@ class UtilsTestCase(unittest.TestCase):
         expected = VersionInfo(1, 25, 2)
         self.assertEqual(version, expected)
 
+    def test_sync_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / "src"
+            dst = Path(tmp) / "dst"
+            (src / "modules").mkdir(parents=True)
+            (src / "main.tf").write_text("main")
+            (src / "modules" / "mod.tf").write_text("mod")
+            (Path(tmp) / "linked").mkdir()
+            (Path(tmp) / "linked" / "link.tf").write_text("link")
+            (src / "linked").symlink_to(Path(tmp) / "linked")
+
+            utils.sync_directory(src, dst, stamp="1")
+            self.assertEqual((dst / "main.tf").read_text(), "main")
+            self.assertEqual((dst / "modules" / "mod.tf").read_text(), "mod")
+            self.assertEqual((dst / "linked" / "link.tf").read_text(), "link")
+
+            # Same stamp skips the copy, user files are kept
+            (dst / "terraform.tfvars.json").write_text("{}")
+            with mock.patch("shutil.copytree") as copytree:
+                utils.sync_directory(src, dst, stamp="1")
+                copytree.assert_not_called()
+            self.assertTrue((dst / "terraform.tfvars.json").exists())
+
+            # New stamp copies all files, including same size changes
+            mtime = (src / "main.tf").stat().st_mtime_ns
+            (src / "main.tf").write_text("mian")
+            os.utime(src / "main.tf", ns=(mtime, mtime))
+            utils.sync_directory(src, dst, stamp="2")
+            self.assertEqual((dst / "main.tf").read_text(), "mian")
+            self.assertTrue((dst / "terraform.tfvars.json").exists())
+
+            # No stamp always copies
+            (src / "modules" / "mod.tf").write_text("changed")
+            utils.sync_directory(src, dst)
+            self.assertEqual((dst / "modules" / "mod.tf").read_text(), "changed")
+
 
 if __name__ == "__main__":
     unittest.main()